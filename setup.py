@@ -9,7 +9,7 @@ import os
 import sys
 from shutil import rmtree
 
-from setuptools import find_packages, setup, Command
+from setuptools import find_packages, setup, Command, Extension
 
 # Package meta-data.
 NAME = 'torch2trt'
@@ -30,6 +30,20 @@ EXTRAS = {
     # 'fancy feature': ['django'],
 }
 
+# Optional cython extension for small shape helpers. torch2trt falls back to
+# pure python versions if it isn't built, so a failed build (e.g. no compiler)
+# doesn't fail the install.
+try:
+    from Cython.Build import cythonize
+    EXT_MODULES = cythonize(
+        [Extension('torch2trt._cext', ['torch2trt/_cext.pyx'], optional=True)],
+        language_level=3)
+    # cythonize recreates extensions and may drop the optional flag
+    for ext in EXT_MODULES:
+        ext.optional = True
+except ImportError:
+    EXT_MODULES = []
+
 # The rest you shouldn't have to touch too much :)
 # ------------------------------------------------
 # Except, perhaps the License and Trove Classifiers!
@@ -111,6 +125,7 @@ setup(
     #     'console_scripts': ['mycli=mymodule:cli'],
     # },
     install_requires=REQUIRED,
+    ext_modules=EXT_MODULES,
     extras_require=EXTRAS,
     include_package_data=True,
     license='MIT',
@@ -0,0 +1,32 @@
+# cython: language_level=3
+"""compiled shape helpers used by tensorrt handlers.
+pure python versions in torch2trt.handlers.ops are used if this extension
+isn't built.
+"""
+
+
+cpdef unsigned int axes_to_trt_axis(axes, int ndim):
+    cdef unsigned int res = 0
+    cdef int ax
+    for ax in axes:
+        if ax == -1:
+            ax = ndim
+        assert ax > 0
+        res |= (<unsigned int>1) << (ax - 1)
+    return res
+
+
+cpdef tuple slice_params(tuple shape, int dim, long long start, long long end,
+                         long long step):
+    cdef int d = dim - 1  # trt shape don't include batch axis
+    cdef int ndim = len(shape)
+    cdef long long size = shape[d]
+    cdef list starts = [0] * ndim
+    cdef list out_shapes = list(shape)
+    cdef list steps = [1] * ndim
+    if end > size:
+        end = size
+    starts[d] = start
+    out_shapes[d] = end - start
+    steps[d] = step
+    return tuple(starts), tuple(out_shapes), tuple(steps)
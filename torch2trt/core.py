@@ -51,6 +51,10 @@ class GlobalContext:
         self.tvm_weight_dict = OrderedDict() # contains tvm var to tvm ndarray
         self.torch_weight_nodes_dict = {}
         self.current_node = None
+        self.use_counts = {} # number of consumers of each node output
+        self.last_conv = None # last conv layer which may fuse following batchnorm
+        self.weight_keep_alive = [] # numpy weights used by trt layers, trt reads them in engine build
+        self.staging_buffers = {} # dtype to pinned buffer for weight copy, dropped after conversion
 
     @property
     def is_tensorrt(self):
@@ -72,8 +76,12 @@ def trt_network(net):
     global CURRENT_CONTEXT
     backup = CURRENT_CONTEXT
     CURRENT_CONTEXT = GlobalContext(net)
-    yield None
-    CURRENT_CONTEXT = backup
+    try:
+        yield None
+    finally:
+        # free pinned memory used to stage weights of this network
+        CURRENT_CONTEXT.staging_buffers.clear()
+        CURRENT_CONTEXT = backup
 
 
 @contextlib.contextmanager
@@ -102,53 +110,54 @@ def register_node_handler(name):
         global REGISTERED_NODE_HANDLERS
         # assert name not in REGISTERED_NODE_HANDLERS, f"exist handlers: {REGISTERED_NODE_HANDLERS.keys()}"
         REGISTERED_NODE_HANDLERS[name] = handler
-        def new_handler(inputs, attributes, scope):
-            return handler(inputs, attributes, scope)
-        return new_handler
+        return handler
 
     return wrap_func
 
 
-def get_node_handler(name):
-    global REGISTERED_NODE_HANDLERS
+def _missing_handler_msg(name):
     msg = "missing handler " + name
     msg += ", available handlers: {}".format(list(REGISTERED_NODE_HANDLERS.keys()))
-    assert name in REGISTERED_NODE_HANDLERS, msg
-    return REGISTERED_NODE_HANDLERS[name]
+    return msg
+
+
+def get_node_handler(name):
+    global REGISTERED_NODE_HANDLERS
+    handler = REGISTERED_NODE_HANDLERS.get(name)
+    # message is only built when assertion fails
+    assert handler is not None, _missing_handler_msg(name)
+    return handler
 
 
 def has_trt_tensor(inputs):
-    res = False
     for inp in inputs:
         if isinstance(inp, (list, tuple)):
-            for elem in inp:
-                res |= has_trt_tensor([elem])
+            if has_trt_tensor(inp):
+                return True
         elif isinstance(inp, trt.ITensor):
             return True
-    return res
+    return False
 
 
 def has_torch_tensor(inputs):
-    res = False
     for inp in inputs:
         if isinstance(inp, (list, tuple)):
-            for elem in inp:
-                res |= has_torch_tensor([elem])
+            if has_torch_tensor(inp):
+                return True
         elif isinstance(inp, torch.Tensor):
             return True
-    return res
+    return False
 
 def has_tvm_tensor(inputs):
     if not tvm_enable():
         return False
-    res = False
     for inp in inputs:
         if isinstance(inp, (list, tuple)):
-            for elem in inp:
-                res |= has_tvm_tensor([elem])
+            if has_tvm_tensor(inp):
+                return True
         elif isinstance(inp, _expr.Expr):
             return True
-    return res
+    return False
 
 def have_tensor(inputs):
     return has_tvm_tensor(inputs) or has_trt_tensor(inputs) or has_torch_tensor(inputs)
@@ -286,6 +295,9 @@ class GraphPy(object):
         self.is_class = False
         self.torch_weight_nodes_dict = set()
         self.unique_name_to_name = {}
+        self.execution_plans = {}
+        self.use_counts = None
+        self.weight_keep_alive = []
 
     def get_output_nodes_dict(self):
         nodes_dict = OrderedDict()
@@ -354,6 +366,57 @@ class GraphPy(object):
     def get_output_names(self):
         return [n.debugName for n in self.output_nodes]
 
+    def get_use_counts(self):
+        """return number of consumers of each output, graph outputs included.
+        """
+        if self.use_counts is None:
+            counts = {}
+            for node in self.nodes_op:
+                for inp_name in node.inputs:
+                    counts[inp_name] = counts.get(inp_name, 0) + 1
+            for name in self.get_output_names():
+                counts[name] = counts.get(name, 0) + 1
+            self.use_counts = counts
+        return self.use_counts
+
+    def get_execution_plan(self, output_name):
+        """return (out_node, plan). plan is a list of (node, input_refs) in
+        evaluation order, input_refs is a list of (input_node, output_idx).
+        graph structure is fixed after parse, so the plan is computed once
+        and reused by every resolve_graph call.
+        """
+        if output_name in self.execution_plans:
+            return self.execution_plans[output_name]
+        out_to_node = self.get_out_to_node()
+        out_to_idx = self.get_out_to_idx()
+        if not isinstance(output_name, str):
+            out_node = output_name
+        else:
+            out_node = out_to_node[output_name]
+        plan = []
+        planned = set()
+        stack = [out_node]
+        while len(stack) > 0:
+            node = stack[-1]
+            if not isinstance(node, NodePyOP) or node in planned:
+                stack.pop()
+                continue
+            prepared = True
+            input_refs = []
+            for inp_name in node.inputs:
+                inp_node = out_to_node[inp_name]
+                if isinstance(inp_node, NodePyOP) and inp_node not in planned:
+                    stack.append(inp_node)
+                    prepared = False
+                input_refs.append((inp_node, out_to_idx[inp_name]))
+            if not prepared:
+                continue
+            plan.append((node, input_refs))
+            planned.add(node)
+            stack.pop()
+        self.execution_plans[output_name] = (out_node, plan)
+        return out_node, plan
+
     def get_resolved_outputs(self):
         """return list of list: first list is list of outputs in net.forward,
         second list is list of output in output node because some mode return multiple outputs.
@@ -518,35 +581,20 @@ def parse(graph, num_inputs, omit_useless_nodes=False, is_class=False):
 
 def resolve_graph(graph_py: GraphPy, output_names, verbose=False):
     ctx = current_context()
-    out_to_node = graph_py.get_out_to_node()
-    out_to_idx = graph_py.get_out_to_idx()
+    ctx.use_counts = graph_py.get_use_counts()
+    num_kept_weights = len(ctx.weight_keep_alive)
     if not isinstance(output_names, (list, tuple)):
         output_names = [output_names]
     node_results = []
     for output_name in output_names:
-        if not isinstance(output_name, str):
-            out_node = output_name
-        else:
-            out_node = out_to_node[output_name]
-        stack = [out_node]
-        while len(stack) > 0:
-            node = stack[-1]
-            if node.resolved:
-                stack.pop()
-                continue
-            
-            inputs = []
-            input_nodes = []
-            prepared = True
-            for inp_name in node.inputs:
-                inp_node = out_to_node[inp_name]
-                if not inp_node.resolved:  # node isn't evaluated
-                    stack.append(inp_node)
-                    prepared = False
-                input_nodes.append(inp_node)
-                inputs.append(inp_node.resolved_outputs[out_to_idx[inp_name]])
-            if not prepared:
+        out_node, plan = graph_py.get_execution_plan(output_name)
+        for node, input_refs in plan:
+            if node.resolved:  # shared with previous outputs
                 continue
+            inputs = [
+                inp_node.resolved_outputs[idx]
+                for inp_node, idx in input_refs
+            ]
             assert node.readable_unique_name is not None
             if verbose:
                 msg = ""
@@ -572,11 +620,13 @@ def resolve_graph(graph_py: GraphPy, output_names, verbose=False):
                     print(msg)
             node.resolved_outputs = list(results)
             node.resolved = True
-            stack.pop()
-        
+
         node_results.append(out_node.resolved_outputs)
     graph_py.refit_weight_dict = ctx.refit_weight_dict
     graph_py.torch_weight_nodes_dict = ctx.torch_weight_nodes_dict
+    # append instead of replace: weights of networks built by earlier calls
+    # (e.g. another trt_network) must stay alive until their engines are built.
+    graph_py.weight_keep_alive.extend(ctx.weight_keep_alive[num_kept_weights:])
     return node_results
 
 def _torch_depoly(module,
@@ -698,19 +748,39 @@ def clean_resolved_outputs(graph_py, output_name):
     recursive_resolve(out_node)
 
 
+def _clone_tensors(obj):
+    """clone all tensors in (nested) list/tuple, keep other objects."""
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_clone_tensors(e) for e in obj)
+    if isinstance(obj, torch.Tensor):
+        return obj.clone()
+    return obj
+
+
 class GraphModule:
     """main entry class of torch2trt/torch2tvm.
     Args:
         module: pytorch nn.Module or function.
         example_inputs: list or tuple of example tensors. MUST match arguments of 
             forward function of module.
+        cuda_graph: bool. capture pytorch mode execution to a cuda graph and
+            replay it for inputs with same shapes. only for graphs without
+            data-dependent control flow, requires torch.cuda.graph (torch>=1.10).
+            only used when grad is disabled, all captured graphs share one
+            memory pool.
     """
     def __init__(self,
                  module,
-                 example_inputs):
+                 example_inputs,
+                 cuda_graph=False):
 
         super().__init__()
         self.module = module
+        if cuda_graph:
+            assert hasattr(torch.cuda, "CUDAGraph"), "your torch don't support cuda graph"
+        self.cuda_graph = cuda_graph
+        self.cuda_graph_cache = {}
+        self.cuda_graph_pool = None
         is_class = isinstance(module, torch.nn.Module)
 
         trace = torch.jit.trace(module, example_inputs, True)
@@ -727,31 +797,68 @@ class GraphModule:
 
     def __call__(self, *args, verbose=False, **kw):
         assert len(kw) == 0, "don't support kw arg"
-        assert all([isinstance(e, (torch.Tensor, trt.ITensor)) for e in args])
+        assert all(isinstance(e, (torch.Tensor, trt.ITensor)) for e in args)
         assert len(args) + int(self.graph.is_class) == len(self.graph.get_input_nodes_dict())
-        output_names = self.graph.get_output_names()
-        for output_name in output_names:
-            clean_resolved_outputs(self.graph, output_name)
         args = list(args)
         arg_for_check = args
         if self.graph.is_class:
             args.insert(0, self.module)
             arg_for_check = args[1:]
-        for i, inode in enumerate(self.graph.get_input_nodes_dict().values()):
-            inode.resolved_outputs[0] = args[i]
         if has_trt_tensor(arg_for_check):
             # trt mode
-            assert all([isinstance(e, trt.ITensor) for e in arg_for_check])
+            assert all(isinstance(e, trt.ITensor) for e in arg_for_check)
             assert current_context().is_tensorrt
         elif has_tvm_tensor(arg_for_check):
-            assert all([isinstance(e, _expr.Expr) for e in arg_for_check])
+            assert all(isinstance(e, _expr.Expr) for e in arg_for_check)
             assert current_context().is_tvm
         else:
-            assert all([isinstance(e, torch.Tensor) for e in arg_for_check])
+            assert all(isinstance(e, torch.Tensor) for e in arg_for_check)
             assert current_context().is_torch, "you should run pytorch mode outside trt_network block"
+            # autograd state can't be captured, run eager when grad is enabled
+            if (self.cuda_graph and not verbose and not torch.is_grad_enabled()
+                    and all(e.is_cuda for e in arg_for_check)):
+                return self._resolve_cuda_graph(args)
+        return self._resolve(args, verbose)
+
+    def _resolve(self, args, verbose=False):
+        output_names = self.graph.get_output_names()
+        for output_name in output_names:
+            clean_resolved_outputs(self.graph, output_name)
+        for i, inode in enumerate(self.graph.get_input_nodes_dict().values()):
+            inode.resolved_outputs[0] = args[i]
         resolve_graph(self.graph, output_names, verbose)
         return self.graph.get_resolved_outputs()
 
+    def _resolve_cuda_graph(self, args):
+        """run pytorch mode by replaying a cuda graph captured once per input
+        shapes. outputs are copied out of static buffers of the graph.
+        """
+        key = tuple((tuple(a.shape), a.dtype, a.device) for a in args
+                    if isinstance(a, torch.Tensor))
+        if key not in self.cuda_graph_cache:
+            static_args = [
+                a.clone() if isinstance(a, torch.Tensor) else a for a in args
+            ]
+            # cuda graph requires a warmup run on side stream before capture
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                self._resolve(static_args)
+            torch.cuda.current_stream().wait_stream(stream)
+            graph = torch.cuda.CUDAGraph()
+            # share one memory pool between graphs of different shapes
+            with torch.cuda.graph(graph, pool=self.cuda_graph_pool):
+                static_outputs = self._resolve(static_args)
+            if self.cuda_graph_pool is None:
+                self.cuda_graph_pool = graph.pool()
+            self.cuda_graph_cache[key] = (graph, static_args, static_outputs)
+        graph, static_args, static_outputs = self.cuda_graph_cache[key]
+        for dst, src in zip(static_args, args):
+            if isinstance(src, torch.Tensor):
+                dst.copy_(src)
+        graph.replay()
+        return _clone_tensors(static_outputs)
+
     def collect_params(self, net):
         """rerun graph in pytorch mode and collect new params
         """
@@ -759,8 +866,14 @@ class GraphModule:
         output_names = self.graph.get_output_names()
         for name in output_names:
             clean_resolved_outputs(self.graph, name)
-        with torch.no_grad():
-            self(net, *self.example_inputs)
+        # params are collected by python side effects of handlers,
+        # so a replayed cuda graph can't be used here.
+        cuda_graph, self.cuda_graph = self.cuda_graph, False
+        try:
+            with torch.no_grad():
+                self(net, *self.example_inputs)
+        finally:
+            self.cuda_graph = cuda_graph
         return self.graph.torch_weight_nodes_dict
 
     def collect_params_v1(self):
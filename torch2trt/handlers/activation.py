@@ -5,7 +5,7 @@ from torch.nn import functional as F
 
 from torch2trt.core import (current_context, has_trt_tensor, has_tvm_tensor,
                             register_node_handler)
-from torch2trt.handlers.ops import _scale_or_elementwise
+from torch2trt.handlers.ops import _keep_weights, _scale_or_elementwise
 from torch2trt.utils import print_inputs
 
 try:
@@ -174,25 +174,40 @@ def aten_softplus(inputs, attributes, scope):
     return [F.softplus(inputs[0], beta, thresh)]
 
 
+def _trt_hardtanh(ctx, inp, min_val, max_val, scope):
+    net = ctx.network
+    if hasattr(trt.ActivationType, "CLIP"):
+        # single activation layer, tensorrt can fuse it into previous conv.
+        layer = net.add_activation(inp, trt.ActivationType.CLIP)
+        layer.alpha = min_val
+        layer.beta = max_val
+        output = layer.get_output(0)
+        output.name = scope
+        layer.name = scope
+        return output
+    # use relu(x) - relu(x - 6) to implement relu6 (subset of hardtanh)
+    # relu(x) - relu(x - 6) implementation is faster than hardsigmoid implementation
+    assert min_val == 0, "only support relu6"
+    layer = net.add_activation(inp, trt.ActivationType.RELU)
+    output = layer.get_output(0)
+    layer.name = scope + "/relu"
+    tensor = np.full([1] * len(inp.shape), max_val, dtype=np.float32)
+    _keep_weights(ctx, tensor)
+    trt_6 = net.add_constant([1] * len(inp.shape), tensor)
+    layer = net.add_elementwise(output, trt_6.get_output(0), trt.ElementWiseOperation.MIN)
+    output = layer.get_output(0)
+    layer.name = scope + "/elem_min"
+    output.name = scope + "/relu6"
+    return output
+
+
 @register_node_handler("aten::hardtanh")
 def aten_hardtanh(inputs, attributes, scope):
     inp, min_val, max_val = inputs[:3]
     ctx = current_context()
     net = current_context().network
     if ctx.is_tensorrt and has_trt_tensor(inputs):
-        # use relu(x) - relu(x - 6) to implement relu6 (subset of hardtanh)
-        # relu(x) - relu(x - 6) implementation is faster than hardsigmoid implementation
-        assert min_val == 0, "only support relu6"
-        layer = net.add_activation(inp, trt.ActivationType.RELU)
-        output = layer.get_output(0)
-        layer.name = scope + "/relu"
-        tensor = np.full([1] * len(inp.shape), max_val, dtype=np.float32)
-        trt_6 = ctx.network.add_constant([1] * len(inp.shape), tensor)
-        layer = ctx.network.add_elementwise(output, trt_6.get_output(0), trt.ElementWiseOperation.MIN)
-        output = layer.get_output(0)
-        layer.name = scope + "/elem_min"
-        output.name = scope + "/relu6"
-        return [output]
+        return [_trt_hardtanh(ctx, inp, min_val, max_val, scope)]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
         raise NotImplementedError
     return [F.hardtanh(inp, min_val, max_val)]
@@ -203,18 +218,7 @@ def aten_hardtanh_(inputs, attributes, scope):
     ctx = current_context()
     net = current_context().network
     if ctx.is_tensorrt and has_trt_tensor(inputs):
-        # use relu(x) - relu(x - 6) to implement relu6 (subset of hardtanh)
-        assert min_val == 0, "only support relu6"
-        layer = net.add_activation(inp, trt.ActivationType.RELU)
-        output = layer.get_output(0)
-        layer.name = scope + "/relu"
-        tensor = np.full([1] * len(inp.shape), max_val, dtype=np.float32)
-        trt_6 = ctx.network.add_constant([1] * len(inp.shape), tensor)
-        layer = ctx.network.add_elementwise(output, trt_6.get_output(0), trt.ElementWiseOperation.MIN)
-        output = layer.get_output(0)
-        layer.name = scope + "/elem_min"
-        output.name = scope + "/relu6"
-        return [output]
+        return [_trt_hardtanh(ctx, inp, min_val, max_val, scope)]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
         raise NotImplementedError
     return [F.hardtanh_(inp, min_val, max_val)]
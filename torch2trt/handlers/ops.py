@@ -17,6 +17,116 @@ try:
 except ImportError:
     pass
 
+try:
+    from torch2trt import _cext
+except ImportError:
+    _cext = None
+
+
+def _to_np(t):
+    """return a contiguous numpy array of tensor. zero-copy for contiguous
+    cpu tensors, numpy array shares memory with (and keeps alive) the tensor.
+    """
+    t = t.detach().contiguous()
+    if t.device.type == "cpu":
+        return t.numpy()
+    return t.cpu().numpy()
+
+
+def _keep_weights(ctx, *arrays):
+    # trt.Weights only holds a pointer and tensorrt reads it when engine
+    # is built, which happens after trt_network block exits.
+    ctx.weight_keep_alive.extend(
+        a for a in arrays if isinstance(a, np.ndarray))
+
+
+class _WeightStager:
+    """copy weight tensors to numpy with a single synchronization.
+    cuda tensors are copied asynchronously to a pinned buffer on a side
+    stream of their device, so layers with several weights (e.g. batchnorm)
+    only wait once. results are copied out to pageable arrays, so the pinned
+    buffer is reused by next call. buffers live in the conversion context and
+    are freed when trt_network exits.
+    """
+    def __init__(self):
+        self._streams = {}
+
+    def _get_stream(self, device):
+        if device not in self._streams:
+            self._streams[device] = torch.cuda.Stream(device)
+        return self._streams[device]
+
+    def _get_buffer(self, ctx, numel, dtype):
+        pinned = ctx.staging_buffers.get(dtype)
+        if pinned is None or pinned.numel() < numel:
+            pinned = torch.empty(numel, dtype=dtype, pin_memory=True)
+            ctx.staging_buffers[dtype] = pinned
+        return pinned
+
+    def stage(self, ctx, *tensors):
+        tensors = [None if t is None else t.detach() for t in tensors]
+        cuda_tensors = [t for t in tensors if t is not None and t.is_cuda]
+        if (len(set(t.dtype for t in cuda_tensors)) != 1
+                or len(set(t.device for t in cuda_tensors)) != 1):
+            # nothing to stage, mixed dtypes or devices, use plain copy.
+            return [None if t is None else _to_np(t) for t in tensors]
+        device = cuda_tensors[0].device
+        pinned = self._get_buffer(
+            ctx, sum(t.numel() for t in cuda_tensors), cuda_tensors[0].dtype)
+        stream = self._get_stream(device)
+        stream.wait_stream(torch.cuda.current_stream(device))
+        staged = []
+        offset = 0
+        with torch.cuda.device(device), torch.cuda.stream(stream):
+            for t in tensors:
+                if t is not None and t.is_cuda:
+                    dst = pinned[offset:offset + t.numel()].view(t.shape)
+                    dst.copy_(t, non_blocking=True)
+                    offset += t.numel()
+                    t = dst
+                staged.append(t)
+        stream.synchronize()
+        res = []
+        for t, src in zip(staged, tensors):
+            if t is None:
+                res.append(None)
+            elif src.is_cuda:
+                # copy out of pinned buffer before it is reused.
+                res.append(t.numpy().copy())
+            else:
+                res.append(_to_np(t))
+        return res
+
+
+_WEIGHT_STAGER = _WeightStager()
+
+_ZERO_F32 = np.zeros(1, dtype=np.float32)
+_ONE_F32 = np.ones(1, dtype=np.float32)
+# empty weights of add_scale use default values (shift 0, scale 1, power 1).
+_EMPTY_WEIGHTS = trt.Weights()
+_ONES_CACHE = {}
+
+
+def _ones_like_f32(n):
+    # weights are read-only for tensorrt, so one array per size is enough.
+    if n not in _ONES_CACHE:
+        _ONES_CACHE[n] = np.ones(n, dtype=np.float32)
+    return _ONES_CACHE[n]
+
+
+def _add_scale(net, inp, mode, shift, scale, num_channels):
+    """add_scale with default power. try empty power weights first, fall back
+    to an explicit ones array if this tensorrt version rejects them.
+    """
+    try:
+        layer = net.add_scale(inp, mode, shift, scale, _EMPTY_WEIGHTS)
+    except (TypeError, RuntimeError):
+        layer = None
+    if layer is None:
+        layer = net.add_scale(inp, mode, shift, scale,
+                              _ones_like_f32(num_channels))
+    return layer
+
 
 @register_node_handler("aten::size")
 def aten_size(inputs, attributes, scope):
@@ -55,7 +165,7 @@ def aten_view(inputs, attributes, scope):
         return [output]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
         return [_op.reshape(inputs[0], newshape=inputs[1])]
-    return [inputs[0].view(*inputs[1])]
+    return [inputs[0].reshape(inputs[1])]
 
 @register_node_handler("aten::clone")
 def aten_clone(inputs, attributes, scope):
@@ -110,8 +220,8 @@ def aten_convolution(inputs, attributes, scope):
         O, I_groups, *ksize = weight.shape
         I = I_groups * groups
     if ctx.is_tensorrt and has_trt_tensor(inputs):
-        assert all([e == 0 for e in output_padding
-                    ]), "tensor rt don't support out padding"
+        assert all(e == 0 for e in output_padding
+                   ), "tensor rt don't support out padding"
         ndim = len(ksize)
         if ndim == 1:
             print("WARNING: consider write conv2d because trt don't support conv2d, we need to change input shape (and output shape) and may cause error in following layers.")
@@ -124,11 +234,10 @@ def aten_convolution(inputs, attributes, scope):
 
         assert ndim <= 2, "tensorrt only support 1d/2d conv"
         # trt weight format: GKCRS: [num_groups, O_groups, I, H, W]
-        weight = weight.detach().cpu().numpy()
-        if bias is not None:
-            trt_bias = bias.detach().cpu().numpy()
-        else:
+        weight, trt_bias = _WEIGHT_STAGER.stage(ctx, weight, bias)
+        if trt_bias is None:
             trt_bias = trt.Weights()
+        _keep_weights(ctx, weight, trt_bias)
         if transposed:
             layer = net.add_deconvolution(inputs[0], O, tuple(ksize), weight,
                                           trt_bias)
@@ -149,15 +258,24 @@ def aten_convolution(inputs, attributes, scope):
         if bias is not None:
             ctx.refit_weight_dict[layer.
                                   name]["bias"] = bias.__torch2trt_weight_name
+        node = ctx.current_node
+        if not transposed and node is not None:
+            ctx.last_conv = {
+                "layer": layer,
+                "output": output,
+                "output_name": node.outputs[0],
+                "weight": weight,
+                "bias": None if bias is None else trt_bias,
+            }
         return [output]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
-        weight = weight.detach().cpu().numpy()
+        weight = _to_np(weight)
         weight_t = _expr.var(
             scope + "/weight", shape=weight.shape, dtype="float32")
         ctx.tvm_weight_dict[weight_t] = weight
         ctx.refit_weight_dict[weight_t.name_hint] = inputs[1].__torch2trt_weight_name
         if bias is not None:
-            bias = bias.detach().cpu().numpy()
+            bias = _to_np(bias)
             bias_t = _expr.var(
                 scope + "/bias", shape=bias.shape, dtype="float32")
             ctx.tvm_weight_dict[bias_t] = bias
@@ -198,6 +316,28 @@ def aten_convolution(inputs, attributes, scope):
     return [res]
 
 
+def _fold_batch_norm_to_conv(ctx, conv, scale, shift, bn_refit_info):
+    """merge batchnorm affine into weights of previous conv layer whose
+    output is only used by this batchnorm, saves a scale layer in engine.
+    """
+    layer = conv["layer"]
+    # don't modify weight inplace, it may share memory with torch tensor.
+    weight = conv["weight"].astype(np.float32, copy=False)
+    kernel = weight * scale.reshape(-1, *([1] * (weight.ndim - 1)))
+    bias = shift
+    if conv["bias"] is not None:
+        bias = conv["bias"].astype(np.float32, copy=False) * scale + shift
+    kernel = np.ascontiguousarray(kernel)
+    bias = np.ascontiguousarray(bias)
+    _keep_weights(ctx, kernel, bias)
+    layer.kernel = kernel
+    layer.bias = bias
+    refit_info = ctx.refit_weight_dict[layer.name]
+    refit_info["type"] = "ConvolutionBatchNorm"
+    refit_info["batchnorm"] = bn_refit_info
+    return conv["output"]
+
+
 @register_node_handler("aten::batch_norm")
 def aten_batch_norm(inputs, attributes, scope):
     inp, weight, bias, running_mean, running_var = inputs[:5]
@@ -206,18 +346,14 @@ def aten_batch_norm(inputs, attributes, scope):
     ctx = current_context()
     net = ctx.network
     if ctx.is_tensorrt and has_trt_tensor(inputs):
-        running_mean = running_mean.detach().cpu().numpy()
-        running_var = running_var.detach().cpu().numpy()
-        weight = weight.detach().cpu().numpy()
-        bias = bias.detach().cpu().numpy()
-        shift = (-running_mean / np.sqrt(running_var + eps)) * weight + bias
-        scale = weight / np.sqrt(running_var + eps)
-        power = np.ones_like(shift)
-        layer = net.add_scale(inp, trt.ScaleMode.CHANNEL, shift, scale, power)
-        output = layer.get_output(0)
-        output.name = scope
-        layer.name = scope
-        ctx.refit_weight_dict[layer.name] = {
+        running_mean, running_var, weight, bias = [
+            t.astype(np.float32, copy=False) for t in _WEIGHT_STAGER.stage(
+                ctx, running_mean, running_var, weight, bias)
+        ]
+        inv_std = np.reciprocal(np.sqrt(running_var + eps, dtype=np.float32))
+        scale = weight * inv_std
+        shift = bias - running_mean * scale
+        refit_info = {
             "type": "BatchNorm",
             "running_mean": inputs[3].__torch2trt_weight_name,
             "running_var": inputs[4].__torch2trt_weight_name,
@@ -225,12 +361,29 @@ def aten_batch_norm(inputs, attributes, scope):
             "bias": inputs[2].__torch2trt_weight_name,
             "eps": eps,
         }
+        conv = ctx.last_conv
+        ctx.last_conv = None
+        node = ctx.current_node
+        # compare graph names instead of tensors: pass-through handlers
+        # (dropout, contiguous, ...) return same trt tensor for other nodes.
+        if (conv is not None and node is not None
+                and node.inputs[0] == conv["output_name"]
+                and ctx.use_counts.get(conv["output_name"]) == 1):
+            return [_fold_batch_norm_to_conv(ctx, conv, scale, shift,
+                                             refit_info)]
+        _keep_weights(ctx, shift, scale)
+        layer = _add_scale(net, inp, trt.ScaleMode.CHANNEL, shift, scale,
+                           len(shift))
+        output = layer.get_output(0)
+        output.name = scope
+        layer.name = scope
+        ctx.refit_weight_dict[layer.name] = refit_info
         return [output]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
-        running_mean = running_mean.detach().cpu().numpy()
-        running_var = running_var.detach().cpu().numpy()
-        weight = weight.detach().cpu().numpy()
-        bias = bias.detach().cpu().numpy()
+        running_mean = _to_np(running_mean)
+        running_var = _to_np(running_var)
+        weight = _to_np(weight)
+        bias = _to_np(bias)
         running_mean_t = _expr.var(
             scope + "/running_mean", shape=running_mean.shape, dtype="float32")
         running_var_t = _expr.var(
@@ -272,8 +425,8 @@ def aten_addmm(inputs, attributes, scope):
         assert beta == 1 and alpha == 1
         assert len(mat_to_add.shape) == 1
         inp = mat1
-        weight = mat2.t().detach().cpu().numpy()
-        bias = mat_to_add.detach().cpu().numpy()
+        weight, bias = _WEIGHT_STAGER.stage(ctx, mat2.t(), mat_to_add)
+        _keep_weights(ctx, weight, bias)
         C = weight.shape[0]
         # use fc to implement this
         if len(inp.shape) < 3:
@@ -290,8 +443,8 @@ def aten_addmm(inputs, attributes, scope):
         return [output]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
         inp = mat1
-        weight = mat2.t().detach().cpu().numpy()
-        bias = mat_to_add.detach().cpu().numpy()
+        weight = _to_np(mat2.t())
+        bias = _to_np(mat_to_add)
         C = weight.shape[0]
         weight_t = _expr.var(
             scope + "/weight", shape=weight.shape, dtype="float32")
@@ -317,11 +470,12 @@ def aten_matmul(inputs, attributes, scope):
     if ctx.is_tensorrt and has_trt_tensor(inputs):
         assert isinstance(mat2, torch.Tensor)
         inp = mat1
-        weight = mat2.t().detach().cpu().numpy()
+        weight = _to_np(mat2.t())
         C = weight.shape[0]
         # use fc to implement this
         if len(inp.shape) < 3:
             inp = _trt_reshape(net, inp, [-1, 1, 1], scope + "/reshape")
+        _keep_weights(ctx, weight)
         layer = net.add_fully_connected(inp, C, weight, trt.Weights())
         output = layer.get_output(0)
         output.name = scope
@@ -333,7 +487,7 @@ def aten_matmul(inputs, attributes, scope):
         return [output]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
         inp = mat1
-        weight = mat2.t().detach().cpu().numpy()
+        weight = _to_np(mat2.t())
         C = weight.shape[0]
         weight_t = _expr.var(
             scope + "/weight", shape=weight.shape, dtype="float32")
@@ -357,15 +511,13 @@ def aten_max_pool2d(inputs, attributes, scope):
         layer = net.add_pooling(inp, trt.PoolingType.MAX, ksize)
         layer.stride = stride
         layer.padding = pad
-        assert all(
-            [b == 1 for b in dilation]), "trt pool don't support dilation"
+        assert all(b == 1 for b in dilation), "trt pool don't support dilation"
         output = layer.get_output(0)
         output.name = scope
         layer.name = scope
         return [output]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
-        assert all(
-            [b == 1 for b in dilation]), "tvm maxpool don't support dilation"
+        assert all(b == 1 for b in dilation), "tvm maxpool don't support dilation"
         new_attrs = {}
         new_attrs["pool_size"] = ksize
         new_attrs["strides"] = stride
@@ -403,8 +555,6 @@ def aten_avg_pool2d(inputs, attributes, scope):
         new_attrs["count_include_pad"] = count_include_pad
         return [_op.nn.avg_pool2d(inp, **new_attrs)]
 
-    inp = inputs[0]
-    ksize, stride, pad, ceil_mode = inputs[1:5]
     res = F.avg_pool2d(inp, ksize, stride, pad, bool(ceil_mode),
                        bool(count_include_pad))
     return [res]
@@ -419,7 +569,7 @@ def aten_adaptive_avg_pool2d(inputs, attributes, scope):
     if ctx.is_tensorrt and has_trt_tensor(inputs):
         inp_shape = inp.shape[1:]
         ksize = [i // k for i, k in zip(inp_shape, ksize)]
-        assert all([i % k == 0 for i, k in zip(inp_shape, ksize)])
+        assert all(i % k == 0 for i, k in zip(inp_shape, ksize))
         layer = net.add_pooling(inp, trt.PoolingType.AVERAGE, ksize)
         # print("WARNING: adaptive_avg_pool2d support is imcomplete")
         output = layer.get_output(0)
@@ -430,12 +580,10 @@ def aten_adaptive_avg_pool2d(inputs, attributes, scope):
         inp_shape = infer_shape(inp)
         inp_shape = inp_shape[2:]
         ksize = [i // k for i, k in zip(inp_shape, ksize)]
-        assert all([i % k == 0 for i, k in zip(inp_shape, ksize)])
+        assert all(i % k == 0 for i, k in zip(inp_shape, ksize))
 
         return [_op.nn.avg_pool2d(inp, ksize)]
 
-    inp = inputs[0]
-    ksize = inputs[1]
     res = F.adaptive_avg_pool2d(inp, ksize)
     return [res]
 
@@ -487,19 +635,26 @@ def aten_cat(inputs, attributes, scope):
     return [res]
 
 
+def _slice_params(shape, dim, start, end, step):
+    d = dim - 1  # trt shape don't include batch axis
+    rest = len(shape) - d - 1
+    end = end if end < shape[d] else shape[d]
+    starts = (0, ) * d + (start, ) + (0, ) * rest
+    out_shapes = shape[:d] + (end - start, ) + shape[d + 1:]
+    steps = (1, ) * d + (step, ) + (1, ) * rest
+    return starts, out_shapes, steps
+
+
+if _cext is not None:
+    _slice_params = _cext.slice_params
+
+
 def _trt_torch_slice(net, inp, dim, start, end, step, name):
-    ndim = len(inp.shape)
-    starts = [0] * ndim
-    out_shapes = [0] * ndim
-    steps = [0] * ndim
-    for i in range(ndim):
-        starts[i] = 0
-        out_shapes[i] = inp.shape[i]
-        steps[i] = 1
-    starts[dim - 1] = start
-    out_shapes[dim - 1] = min(end, inp.shape[dim - 1]) - start
-    steps[dim - 1] = step
-    layer = net.add_slice(inp, tuple(starts), tuple(out_shapes), tuple(steps))
+    # python and cython _slice_params only agree for non-batch, positive dims
+    assert dim > 0, "tensorrt don't support batch axis operation"
+    starts, out_shapes, steps = _slice_params(tuple(inp.shape), dim, start,
+                                              end, step)
+    layer = net.add_slice(inp, starts, out_shapes, steps)
     output = layer.get_output(0)
     layer.name = name
     return output
@@ -629,52 +784,48 @@ def aten_select(inputs, attributes, scope):
     return [inp[slices].squeeze(dim)]
 
 
+_TRT_OP = {
+    "add": trt.ElementWiseOperation.SUM,
+    "sub": trt.ElementWiseOperation.SUB,
+    "mul": trt.ElementWiseOperation.PROD,
+    "div": trt.ElementWiseOperation.DIV,
+}
+
+# op -> function of scalar which returns (shift, scale) of add_scale.
+_SCALAR_TABLE = {
+    "add": lambda s: (np.asarray([s], dtype=np.float32), _ONE_F32),
+    "sub": lambda s: (np.asarray([-s], dtype=np.float32), _ONE_F32),
+    "mul": lambda s: (_ZERO_F32, np.asarray([s], dtype=np.float32)),
+    "div": lambda s: (_ZERO_F32, np.asarray([1 / s], dtype=np.float32)),
+}
+
+
 def _scale_or_elementwise(net, lfs, rfs, op, name):
     """pytorch elementwise may contains constants.
     if contains constant, use add_scale, otherwise use add_elementwise
     """
-    trt_op = {
-        "add": trt.ElementWiseOperation.SUM,
-        "sub": trt.ElementWiseOperation.SUB,
-        "mul": trt.ElementWiseOperation.PROD,
-        "div": trt.ElementWiseOperation.DIV,
-    }
-    assert op in trt_op
-    assert not all([isinstance(t, torch.Tensor) for t in [lfs, rfs]])
-    if all([isinstance(t, trt.ITensor) for t in [lfs, rfs]]):
-        layer = net.add_elementwise(lfs, rfs, trt_op[op])
+    assert op in _TRT_OP
+    assert not all(isinstance(t, torch.Tensor) for t in (lfs, rfs))
+    if all(isinstance(t, trt.ITensor) for t in (lfs, rfs)):
+        layer = net.add_elementwise(lfs, rfs, _TRT_OP[op])
         layer.name = name
         output = layer.get_output(0)
         return output
     if isinstance(rfs, torch.Tensor):
-        val = rfs.detach().cpu().numpy()
+        val = _to_np(rfs)
         main = lfs
-        scale = val
         if val.size == 1:
             # use scale implementation
-            if op == "add":
-                shift = trt.Weights(np.array(scale, dtype=np.float32))
-                scale = trt.Weights(np.array(1, dtype=np.float32))
-            elif op == "sub":
-                shift = trt.Weights(np.array(-scale, dtype=np.float32))
-                scale = trt.Weights(np.array(1, dtype=np.float32))
-            elif op == "mul":
-                shift = trt.Weights(np.array(0, dtype=np.float32))
-                scale = trt.Weights(np.array(scale, dtype=np.float32))
-            elif op == "div":
-                shift = trt.Weights(np.array(0, dtype=np.float32))
-                scale = trt.Weights(np.array(1 / scale, dtype=np.float32))
-            else:
-                raise NotImplementedError
-            power = trt.Weights(np.array(1, dtype=np.float32))
-            layer = net.add_scale(main, trt.ScaleMode.UNIFORM, shift, scale,
-                                  power)
+            shift, scale = _SCALAR_TABLE[op](val.item())
+            _keep_weights(current_context(), shift, scale)
+            layer = _add_scale(net, main, trt.ScaleMode.UNIFORM,
+                               trt.Weights(shift), trt.Weights(scale), 1)
         else:
             lfs, rfs = try_convert_to_constant(net, [lfs, rfs])
-            layer = net.add_elementwise(lfs, rfs, trt_op[op])
+            layer = net.add_elementwise(lfs, rfs, _TRT_OP[op])
     else:
         lfs, rfs = try_convert_to_constant(net, [lfs, rfs])
-        layer = net.add_elementwise(lfs, rfs, trt_op[op])
+        layer = net.add_elementwise(lfs, rfs, _TRT_OP[op])
     layer.name = name
     output = layer.get_output(0)
     return output
@@ -686,13 +837,16 @@ def try_convert_to_constant(net, inputs):
     for inp in inputs:
         if isinstance(inp, trt.ITensor):
             ref_shape = inp.shape
+    staged = iter(_WEIGHT_STAGER.stage(
+        current_context(), *[inp for inp in inputs if isinstance(inp, torch.Tensor)]))
     for inp in inputs:
         if isinstance(inp, torch.Tensor):
-            inp = inp.detach().cpu().numpy()
+            inp = next(staged)
             if inp.dtype == np.float64:
                 inp = inp.astype(np.float32)
             if len(inp.shape) == 0:
                 inp = inp.reshape(*([1] * len(ref_shape)))
+            _keep_weights(current_context(), inp)
             layer = net.add_constant(inp.shape, trt.Weights(inp))
             inp = layer.get_output(0)
         res.append(inp)
@@ -743,7 +897,6 @@ def _tvm_to_const(args):
 
 @register_node_handler("aten::mul")
 def aten_mul(inputs, attributes, scope):
-    # print_inputs(inputs)
     lfs, rfs = inputs
     ctx = current_context()
     net = ctx.network
@@ -759,7 +912,6 @@ def aten_mul(inputs, attributes, scope):
 
 @register_node_handler("aten::mul_")
 def aten_mul_(inputs, attributes, scope):
-    # print_inputs(inputs)
     lfs, rfs = inputs
     ctx = current_context()
     net = ctx.network
@@ -811,7 +963,6 @@ def aten_add(inputs, attributes, scope):
 
 @register_node_handler("aten::div")
 def aten_div(inputs, attributes, scope):
-    # print_inputs(inputs)
     lfs, rfs = inputs
     ctx = current_context()
     net = ctx.network
@@ -827,7 +978,6 @@ def aten_div(inputs, attributes, scope):
 
 @register_node_handler("aten::sub")
 def aten_sub(inputs, attributes, scope):
-    # print_inputs(inputs)
     lfs, rfs, alpha = inputs
     assert alpha == 1
     ctx = current_context()
@@ -844,14 +994,17 @@ def aten_sub(inputs, attributes, scope):
 
 
 def _axes_to_trt_axis(axes, ndim):
-    bit = np.array(1, dtype=np.uint32)
-    res = np.array(0, dtype=np.uint32)
+    res = 0
     for ax in axes:
         if ax == -1:
             ax = ndim
         assert ax > 0
-        res = np.bitwise_or(res, bit << (ax - 1))
-    return int(res)
+        res |= 1 << (ax - 1)
+    return res
+
+
+if _cext is not None:
+    _axes_to_trt_axis = _cext.axes_to_trt_axis
 
 
 @register_node_handler("aten::sum")
@@ -986,7 +1139,7 @@ def aten_permute(inputs, attributes, scope):
     net = ctx.network
     if ctx.is_tensorrt and has_trt_tensor(inputs):
         perm_params = params[1:]
-        assert all([p > 0 for p in perm_params])
+        assert all(p > 0 for p in perm_params)
         layer = net.add_shuffle(inp)
         layer.first_transpose = tuple(p - 1 for p in perm_params)
         output = layer.get_output(0)
@@ -995,7 +1148,7 @@ def aten_permute(inputs, attributes, scope):
         return [output]
     elif ctx.is_tvm and has_tvm_tensor(inputs):
         return [_op.transform.transpose(inp, params)]
-    return [inputs[0].permute(*params)]
+    return [inputs[0].permute(tuple(params))]
 
 
 @register_node_handler("aten::transpose")
@@ -1004,7 +1157,7 @@ def aten_transpose(inputs, attributes, scope):
     ctx = current_context()
     net = ctx.network
     if ctx.is_tensorrt and has_trt_tensor(inputs):
-        assert all([p > 0 for p in [dim0, dim1]])
+        assert dim0 > 0 and dim1 > 0
         params = list(range(len(inp.shape)))
         tmp = params[dim1 - 1]
         params[dim1 - 1] = params[dim0 - 1]
@@ -1134,6 +1287,7 @@ def aten_repeat(inputs, attributes, scope):
         for p, s in zip(params[1:], inp.shape):
             if p > 1:
                 repeat_weights = np.tile(np.arange(0, s), [p]).astype(np.int32)
+                _keep_weights(ctx, repeat_weights)
                 layer = net.add_constant([s * p],
                                          trt.Weights(repeat_weights))
                 layer.name = scope + "/" + "constant_{}".format(i)
@@ -170,7 +170,7 @@ class TorchInferenceContext(InferenceContext):
         self.cuda_context = cuda_context
 
     def execute_async(self, batch_size):
-        assert all([inp.device_input for inp in self.inputs]), "all input must be cuda tensor"
+        assert all(inp.device_input for inp in self.inputs), "all input must be cuda tensor"
         for i in range(len(self.inputs)):
             inp = self.inputs[i]
             if inp.device_input is False:
@@ -159,7 +159,7 @@ class TensorRTModule(nn.Module):
             if self.need_refit:
                 self.refit_engine(self)
                 self.need_refit = False
-            assert all([a.is_cuda for a in args])
+            assert all(a.is_cuda for a in args)
             torch.cuda.synchronize()
             output_dict = self.ctx.inference_async(*args)
             outputs = [None] * len(output_dict)
@@ -200,7 +200,7 @@ class TensorRTModuleWrapper(TensorRTModule):
             if self.need_refit:
                 self.refit_engine(self.net)
                 self.need_refit = False
-            assert all([a.is_cuda for a in args])
+            assert all(a.is_cuda for a in args)
             torch.cuda.synchronize()
             # args = [a.detach().cpu().numpy() for a in args]
             output_dict = self.ctx.inference_async(*args)
@@ -340,7 +340,7 @@ class TVMModule(nn.Module):
             if self.need_refit:
                 self.refit_engine(self)
                 self.need_refit = False
-            assert all([a.is_cuda for a in args])
+            assert all(a.is_cuda for a in args)
             outputs = self.ctx.inference_torch(*args)
             if len(outputs) == 1:
                 return outputs[0]
@@ -370,7 +370,7 @@ class TVMModuleWrapper(TVMModule):
             if self.need_refit:
                 self.refit_engine(self.net)
                 self.need_refit = False
-            assert all([a.is_cuda for a in args])
+            assert all(a.is_cuda for a in args)
             outputs = self.ctx.inference_torch(*args)
             if len(outputs) == 1:
                 return outputs[0]